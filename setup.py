@@ -33,6 +33,10 @@ setuptools.setup(
     # Package dependencies required for installation.
     install_requires=[
     ],
+    # Optional speedups: 'pip install memory-tools-client[perf]'.
+    extras_require={
+        "perf": ["orjson>=3.9", "uvloop>=0.21; sys_platform != 'win32'"],
+    },
     # Compatible Python versions.
     python_requires=">=3.13.5",
 )
\ No newline at end of file
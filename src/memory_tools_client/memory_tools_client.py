@@ -1,10 +1,32 @@
 import asyncio
+import contextlib
+import socket
 import ssl
 import json
 import struct
-from typing import Any, Dict, List, Optional, Union
+import time
+from collections import OrderedDict, deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 import logging
 
+try:
+    import orjson
+except ImportError:  # Optional speedup, installed with the 'perf' extra
+    orjson = None
+
 # Logging configuration for diagnostics
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -30,6 +52,15 @@ CMD_BEGIN = 25
 CMD_COMMIT = 26
 CMD_ROLLBACK = 27
 
+# Response framing: status (uint8) + message length (uint32), then message, then data length (uint32) + data
+_RESPONSE_HEADER = struct.Struct("<BL")
+_UINT32 = struct.Struct("<L")
+
+# Single-byte command headers, built once instead of per request
+_COMMAND_BYTES = tuple(bytes((code,)) for code in range(256))
+
+T = TypeVar("T")
+
 # --- Server Response Statuses ---
 STATUS_OK = 1
 STATUS_NOT_FOUND = 2
@@ -39,6 +70,26 @@ STATUS_UNAUTHORIZED = 5
 STATUS_BAD_REQUEST = 6
 
 
+# --- JSON Codec ---
+# orjson is used when available; both paths produce UTF-8 JSON bytes.
+if orjson is not None:
+
+    def _json_dumps(value: Any) -> bytes:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            # Values orjson rejects but json accepts, e.g. integers wider than 64 bits.
+            return json.dumps(value).encode("utf-8")
+
+    _json_loads = orjson.loads
+else:
+
+    def _json_dumps(value: Any) -> bytes:
+        return json.dumps(value).encode("utf-8")
+
+    _json_loads = json.loads
+
+
 def get_status_string(status: int) -> str:
     """Converts a numeric status code to its string representation."""
     return {
@@ -70,8 +121,8 @@ class CommandResponse:
         """Tries to decode the raw data as JSON."""
         if self.raw_data:
             try:
-                return json.loads(self.raw_data)
-            except json.JSONDecodeError:
+                return _json_loads(self.raw_data)
+            except json.JSONDecodeError:  # orjson.JSONDecodeError is a subclass
                 return None
         return None
 
@@ -112,7 +163,7 @@ class Query:
     def to_json(self) -> bytes:
         """Serializes the query object to a JSON byte string."""
         data = {key: value for key, value in self.__dict__.items() if value is not None}
-        return json.dumps(data).encode("utf-8")
+        return _json_dumps(data)
 
 
 # --- Binary Protocol Helper Functions ---
@@ -127,6 +178,13 @@ def write_bytes(b: bytes) -> bytes:
     return struct.pack("<L", len(b)) + b
 
 
+def _encode_json(value: Any) -> bytes:
+    """Serializes a value to UTF-8 JSON. Bytes are assumed to be pre-encoded JSON and passed through."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value)
+    return _json_dumps(value)
+
+
 async def read_n_bytes(reader: asyncio.StreamReader, n: int) -> bytes:
     """Reads exactly n bytes from the stream reader."""
     data = await reader.readexactly(n)
@@ -135,6 +193,163 @@ async def read_n_bytes(reader: asyncio.StreamReader, n: int) -> bytes:
     return data
 
 
+# --- Client-Side Response Cache ---
+# Dependency key for reads of the collection list itself.
+_COLLECTIONS = None
+
+
+def _indexes_of(collection_name: str) -> Tuple[str, str]:
+    """Dependency key for a collection's index list, kept apart from its items."""
+    return ("indexes", collection_name)
+
+
+class _ResponseCache:
+    """
+    A TTL + LRU cache of read responses. Each entry records the version of every
+    collection it was read from; a write bumps that collection's version, which
+    invalidates the dependent entries without having to scan the cache.
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        # (command, payload) -> (expires at, dependencies, their versions, response)
+        self._entries: "OrderedDict[Tuple[int, bytes], Tuple]" = OrderedDict()
+        self._versions: Dict[Any, int] = {}
+        self._epoch = 0
+
+    def snapshot(self, dependencies: Tuple) -> Tuple:
+        """Captures the current versions of `dependencies`, taken before the read is sent."""
+        return (self._epoch,) + tuple(self._versions.get(d, 0) for d in dependencies)
+
+    def get(self, key: Tuple[int, bytes]) -> Optional["CommandResponse"]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, dependencies, versions, response = entry
+            if (
+                expires_at > time.monotonic()
+                and self.snapshot(dependencies) == versions
+            ):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return response
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(
+        self,
+        key: Tuple[int, bytes],
+        dependencies: Tuple,
+        versions: Tuple,
+        response: "CommandResponse",
+    ):
+        # A write that landed while the read was in flight makes its result unsafe to keep.
+        if self.snapshot(dependencies) != versions:
+            return
+        self._entries[key] = (
+            time.monotonic() + self.ttl,
+            dependencies,
+            versions,
+            response,
+        )
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, *dependencies: Any):
+        for dependency in dependencies:
+            self._versions[dependency] = self._versions.get(dependency, 0) + 1
+
+    def clear(self):
+        self._epoch += 1
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": True,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+        }
+
+
+class _RecentWrites:
+    """
+    The encoded values of items this client set or updated, least recently written first,
+    bounded by their total size in bytes. Forgetting a whole collection bumps its version
+    instead of scanning the entries; entries from an older version are dropped when read.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[int, bytes]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._bytes = 0
+
+    def get(self, collection_name: str, key: str) -> Optional[bytes]:
+        item = (collection_name, key)
+        entry = self._entries.get(item)
+        if entry is None:
+            return None
+        version, value = entry
+        if version != self._versions.get(collection_name, 0):
+            self.forget(collection_name, key)
+            return None
+        return value
+
+    def put(self, collection_name: str, key: str, value: bytes):
+        self.forget(collection_name, key)
+        if len(value) > self.max_bytes:
+            return
+        version = self._versions.get(collection_name, 0)
+        self._entries[(collection_name, key)] = (version, value)
+        self._bytes += len(value)
+        while self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def forget(self, collection_name: str, key: str):
+        entry = self._entries.pop((collection_name, key), None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
+
+    def forget_collection(self, collection_name: str):
+        self._versions[collection_name] = self._versions.get(collection_name, 0) + 1
+
+    def clear(self):
+        self._entries.clear()
+        self._versions.clear()
+        self._bytes = 0
+
+
+def _merge_patch(value: bytes, patch: Union[Dict, bytes]) -> Optional[bytes]:
+    """Applies an update's top-level patch to a locally known JSON value, or None if either isn't an object."""
+    current = _json_loads(value)
+    if isinstance(patch, (bytes, bytearray, memoryview)):
+        patch = _json_loads(patch)
+    if not isinstance(current, dict) or not isinstance(patch, dict):
+        return None
+    current.update(patch)
+    return _json_dumps(current)
+
+
+def _query_dependencies(collection_name: str, query: Union[Query, bytes]) -> Tuple:
+    """Collections a query reads from: its own plus any joined through lookups."""
+    if isinstance(query, bytes):
+        # Only pre-encoded queries that mention lookups need to be decoded.
+        lookups = _json_loads(query).get("lookups") if b'"lookups"' in query else None
+    else:
+        lookups = query.lookups
+    return (collection_name,) + tuple(
+        lookup["from"] for lookup in lookups or () if "from" in lookup
+    )
+
+
 # --- Main Client Class ---
 class MemoryToolsClient:
     """Asynchronous client to interact with a Memory Tools server."""
@@ -147,7 +362,18 @@ class MemoryToolsClient:
         password: Optional[str] = None,
         server_cert_path: Optional[str] = None,
         reject_unauthorized: bool = True,
+        cache_ttl: float = 0,
+        cache_size: int = 256,
+        remember_writes: bool = False,
+        remember_writes_bytes: int = 1 << 20,
     ):
+        """
+        `cache_ttl` (seconds) enables a client-side cache for `collection_list`,
+        `collection_index_list` and `collection_query`. Entries are invalidated by this client's own writes only,
+        so leave it disabled (the default) when other clients write the same data.
+        `remember_writes` keeps the items this client sets or updates, up to `remember_writes_bytes`
+        of encoded values, so `collection_item_get(..., allow_local=True)` can return them.
+        """
         self.host = host
         self.port = port
         self.username = username
@@ -158,6 +384,22 @@ class MemoryToolsClient:
         self.writer: Optional[asyncio.StreamWriter] = None
         self.authenticated_user: Optional[str] = None
         self._lock = asyncio.Lock()
+        # True while commands are being pipelined behind an unanswered authentication frame.
+        self._auth_pending = False
+        # Futures for in-flight commands, in the order their frames were written,
+        # each with the response class its reply is decoded into.
+        self._pending: Deque[Tuple[asyncio.Future, type]] = deque()
+        # Frame parts queued during the current loop iteration, written to the socket together.
+        self._outgoing: List[bytes] = []
+        self._reader_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._cache: Optional[_ResponseCache] = (
+            _ResponseCache(cache_ttl, cache_size) if cache_ttl > 0 else None
+        )
+        # Items this client set or updated, served by `collection_item_get(..., allow_local=True)`.
+        self._recent_writes: Optional[_RecentWrites] = (
+            _RecentWrites(remember_writes_bytes) if remember_writes else None
+        )
 
     @property
     def is_authenticated(self) -> bool:
@@ -166,12 +408,34 @@ class MemoryToolsClient:
 
     async def connect(self):
         """Establishes a secure connection to the server and authenticates if credentials are provided."""
+        await self._connect()
+
+    async def connect_and(
+        self, operation: Callable[["MemoryToolsClient"], Awaitable[T]]
+    ) -> T:
+        """
+        Connects and runs `operation(client)`, pipelining its first command right behind
+        the authentication frame instead of waiting for the authentication reply first.
+        Raises PermissionError if authentication fails.
+        """
+        pipelined = await self._connect(operation)
+        if pipelined is None:
+            return await operation(self)
+        return await pipelined
+
+    async def _connect(
+        self,
+        operation: Optional[Callable[["MemoryToolsClient"], Awaitable[Any]]] = None,
+    ) -> Optional[asyncio.Future]:
+        """Opens and authenticates the connection. Returns the task running `operation` if it was pipelined."""
         async with self._lock:
             if self.writer and not self.writer.is_closing():
-                return
-            if self.writer:
-                self.writer.close()
-                await self.writer.wait_closed()
+                return None
+            # The reader task and command futures all live on this loop, so it is resolved once here.
+            self._loop = asyncio.get_running_loop()
+            await self._disconnect(
+                ConnectionResetError("Connection was re-established.")
+            )
 
             ssl_context = ssl.create_default_context(cafile=self.server_cert_path)
             if not self.reject_unauthorized:
@@ -183,48 +447,160 @@ class MemoryToolsClient:
                     self.host, self.port, ssl=ssl_context
                 )
                 logging.info(f"Client: Securely connected to {self.host}:{self.port}")
+                self._set_nodelay()
+                self._reader_task = asyncio.create_task(self._read_loop())
                 if self.username and self.password:
-                    await self._perform_authentication(self.username, self.password)
+                    return await self._perform_authentication(
+                        self.username, self.password, operation
+                    )
+                return None
             except Exception as e:
                 self.authenticated_user = None
+                # Release the socket and reader now, so a failed connect leaves nothing for close() to do.
+                await self._disconnect(ConnectionError(f"Connection failed: {e}"))
                 logging.error(f"Client: Connection failed: {e}")
                 raise
 
-    async def _perform_authentication(self, username: str, password: str):
-        """Sends the authentication command to the server."""
+    def _set_nodelay(self):
+        """Disables Nagle's algorithm so small request frames are sent without delay."""
+        # asyncio's default loop already does this; other loop implementations may not.
+        sock = self.writer.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    async def _perform_authentication(
+        self,
+        username: str,
+        password: str,
+        operation: Optional[Callable[["MemoryToolsClient"], Awaitable[Any]]] = None,
+    ) -> Optional[asyncio.Future]:
+        """
+        Sends the authentication command to the server.
+        If `operation` is given it is started right away, so its first command is queued in
+        the same write as the authentication frame; the task running it is returned.
+        """
         if not self.writer:
             raise ConnectionError("Client is not connected.")
         payload = write_string(username) + write_string(password)
-        command_buffer = bytes([CMD_AUTHENTICATE]) + payload
-        self.writer.write(command_buffer)
-        await self.writer.drain()
-        status, message, _ = await self._read_response_tuple()
-        if status == STATUS_OK:
+        reply = asyncio.ensure_future(self._submit(CMD_AUTHENTICATE, payload))
+        pipelined = None
+        if operation is not None:
+            self._auth_pending = True
+            pipelined = asyncio.ensure_future(operation(self))
+        try:
+            response = await reply
+        except BaseException:
+            if pipelined is not None:
+                pipelined.cancel()
+            raise
+        finally:
+            self._auth_pending = False
+        if response.ok:
             self.authenticated_user = username
             logging.info(f"Authentication successful for user '{username}'.")
-        else:
-            self.authenticated_user = None
-            raise PermissionError(
-                f"Authentication failed: {get_status_string(status)}: {message}"
-            )
+            return pipelined
+        self.authenticated_user = None
+        if pipelined is not None:
+            pipelined.cancel()
+        raise PermissionError(
+            f"Authentication failed: {response.status}: {response.message}"
+        )
 
     async def _read_response_tuple(self) -> tuple[int, str, bytes]:
         """Reads a complete response from the server according to the binary protocol."""
         if not self.reader:
             raise ConnectionError("Client is not connected.")
-        status = (await read_n_bytes(self.reader, 1))[0]
-        msg_len = struct.unpack("<L", await read_n_bytes(self.reader, 4))[0]
-        message = (await read_n_bytes(self.reader, msg_len)).decode("utf-8")
-        data_len = struct.unpack("<L", await read_n_bytes(self.reader, 4))[0]
-        data = await read_n_bytes(self.reader, data_len)
+        status, msg_len = _RESPONSE_HEADER.unpack(
+            await read_n_bytes(self.reader, _RESPONSE_HEADER.size)
+        )
+        # The data length directly follows the message, so both are read in one call.
+        tail = await read_n_bytes(self.reader, msg_len + _UINT32.size)
+        message = tail[:msg_len].decode("utf-8")
+        (data_len,) = _UINT32.unpack_from(tail, msg_len)
+        data = await read_n_bytes(self.reader, data_len) if data_len else b""
         return status, message, data
 
-    async def _read_response(self) -> CommandResponse:
-        """Reads a response and wraps it in a CommandResponse object."""
-        status, message, data = await self._read_response_tuple()
-        return CommandResponse(status, message, data)
+    async def _read_loop(self):
+        """Reads responses as they arrive and resolves them in the order the commands were sent."""
+        try:
+            while True:
+                status, message, data = await self._read_response_tuple()
+                future, response_class = self._pending.popleft()
+                if not future.done():
+                    future.set_result(response_class(status, message, data))
+        except Exception as e:
+            # The stream is no longer in sync with the pending queue; fail everything in flight.
+            self._fail_pending(ConnectionResetError(f"Connection lost: {e}"))
+            if self.writer:
+                self.writer.close()
+
+    def _fail_pending(self, error: Exception):
+        """Fails every command still waiting for a response."""
+        self._outgoing = []
+        while self._pending:
+            future, _ = self._pending.popleft()
+            if not future.done():
+                future.set_exception(error)
+
+    def _stop_reader(self, error: Exception):
+        """Stops the response reader and fails any in-flight commands."""
+        if self._reader_task:
+            self._reader_task.cancel()
+            self._reader_task = None
+        self._fail_pending(error)
+
+    def _submit(
+        self,
+        command_type: int,
+        payload: bytes,
+        response_class: type = CommandResponse,
+    ) -> Awaitable[CommandResponse]:
+        """
+        Queues a command frame and returns an awaitable for its response, decoded into `response_class`.
+        The frame is queued when this is called, not when the result is awaited, so callers
+        can order frames without waiting for earlier replies.
+        Frames from concurrent callers are pipelined on the same connection; the server
+        answers them in order, so each caller is matched to its response by position.
+        Frames submitted in the same loop iteration are coalesced into a single write, and
+        the command byte and payload are only joined there, so the payload is copied once.
+        """
+        future = self._loop.create_future()
+        self._pending.append((future, response_class))
+        first_in_batch = not self._outgoing
+        self._outgoing.append(_COMMAND_BYTES[command_type])
+        self._outgoing.append(payload)
+        return self._await_reply(future, first_in_batch)
+
+    async def _await_reply(
+        self, future: asyncio.Future, first_in_batch: bool
+    ) -> CommandResponse:
+        """Writes the batch if `future`'s frame opened it, then waits for the reply."""
+        try:
+            if first_in_batch:
+                try:
+                    # First frame of a batch: let other ready tasks queue theirs before writing.
+                    await asyncio.sleep(0)
+                finally:
+                    self._flush_outgoing()
+                if self.writer:  # Closed meanwhile: the future has already been failed
+                    await self.writer.drain()
+        except BaseException:
+            future.cancel()
+            raise
+        return await future
 
-    async def _send_command(self, command_type: int, payload: bytes) -> CommandResponse:
+    def _flush_outgoing(self):
+        """Writes every queued frame to the transport in one call."""
+        parts, self._outgoing = self._outgoing, []
+        if parts and self.writer:
+            self.writer.write(b"".join(parts))
+
+    async def _send_command(
+        self,
+        command_type: int,
+        payload: bytes,
+        response_class: type = CommandResponse,
+    ) -> CommandResponse:
         """Sends a command with its payload and reads the response, handling re connections."""
         if not self.writer or self.writer.is_closing():
             await self.connect()
@@ -232,31 +608,94 @@ class MemoryToolsClient:
         if not self.writer:
             raise ConnectionError("Client is not connected.")
 
-        if command_type != CMD_AUTHENTICATE and not self.is_authenticated:
+        if command_type != CMD_AUTHENTICATE and not (
+            self.is_authenticated or self._auth_pending
+        ):
             raise PermissionError("Client is not authenticated.")
 
         try:
-            self.writer.write(bytes([command_type]) + payload)
-            await self.writer.drain()
-            return await self._read_response()
+            return await self._submit(command_type, payload, response_class)
         except (ConnectionResetError, BrokenPipeError) as e:
+            if self._auth_pending:
+                raise  # The authentication outcome decides what happens to this connection
             logging.warning(f"Connection lost: {e}. Attempting to reconnect...")
             await self.connect()  # Reconnect
             # Retry the command once
-            self.writer.write(bytes([command_type]) + payload)
-            await self.writer.drain()
-            return await self._read_response()
+            return await self._submit(command_type, payload, response_class)
+
+    async def _send_read(
+        self, command_type: int, payload: bytes, dependencies: Tuple
+    ) -> CommandResponse:
+        """Sends a read-only command, serving it from the response cache when enabled."""
+        if self._cache is None:
+            return await self._send_command(command_type, payload)
+        key = (command_type, payload)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        versions = self._cache.snapshot(dependencies)
+        response = await self._send_command(command_type, payload)
+        if response.ok:
+            self._cache.put(key, dependencies, versions, response)
+        return response
+
+    def _invalidate(self, *dependencies: Any):
+        """Marks cached reads of the given collections as stale after a write."""
+        if self._cache is not None:
+            self._cache.invalidate(*dependencies)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters for the client-side cache."""
+        if self._cache is None:
+            return {
+                "enabled": False,
+                "hits": 0,
+                "misses": 0,
+                "hit_rate": 0.0,
+                "size": 0,
+            }
+        return self._cache.stats()
+
+    def cache_clear(self):
+        """Drops every cached response and remembered write, e.g. after another client changed the data."""
+        if self._cache is not None:
+            self._cache.clear()
+        if self._recent_writes is not None:
+            self._recent_writes.clear()
+
+    def _remember_write(self, collection_name: str, key: str, value: Optional[bytes]):
+        """Records the value an acknowledged write left under `key`, or forgets it if unknown."""
+        if self._recent_writes is None:
+            return
+        if value is None:
+            self._recent_writes.forget(collection_name, key)
+        else:
+            self._recent_writes.put(collection_name, key, value)
+
+    def _forget_writes(self, collection_name: str):
+        """Forgets every recorded write to a collection."""
+        if self._recent_writes is not None:
+            self._recent_writes.forget_collection(collection_name)
+
+    async def _disconnect(self, error: Exception) -> bool:
+        """Stops the reader, fails in-flight commands and closes the transport, if any."""
+        self._stop_reader(error)
+        writer, self.reader, self.writer = self.writer, None, None
+        if not writer:
+            return False
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (ConnectionError, ssl.SSLError):
+            pass  # Ignore errors on close
+        return True
 
     async def close(self):
         """Closes the connection to the server."""
-        if self.writer:
-            self.writer.close()
-            try:
-                await self.writer.wait_closed()
-            except ConnectionError:
-                pass  # Ignore errors on close
+        was_connected = await self._disconnect(ConnectionError("Connection closed."))
         self.authenticated_user = None
-        logging.info("Connection closed.")
+        if was_connected:
+            logging.info("Connection closed.")
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -274,23 +713,60 @@ class MemoryToolsClient:
 
     async def commit(self) -> CommandResponse:
         """Commits the current transaction."""
-        return await self._send_command(CMD_COMMIT, b"")
+        response = await self._send_command(CMD_COMMIT, b"")
+        self.cache_clear()
+        return response
 
     async def rollback(self) -> CommandResponse:
         """Rolls back the current transaction."""
-        return await self._send_command(CMD_ROLLBACK, b"")
+        response = await self._send_command(CMD_ROLLBACK, b"")
+        self.cache_clear()
+        return response
+
+    @contextlib.asynccontextmanager
+    async def transaction(self) -> AsyncIterator["MemoryToolsClient"]:
+        """
+        Runs the enclosed block in a transaction: commits if it completes, rolls back if it raises.
+        BEGIN is not awaited on its own; it is written together with the block's first command.
+        Raises if the server rejects BEGIN or COMMIT. If BEGIN is rejected (e.g. a transaction
+        is already open), the block's commands have already run outside any transaction, and
+        nothing is rolled back, so an enclosing transaction is left intact.
+        """
+        if not self.writer or self.writer.is_closing():
+            await self.connect()
+        if not self.is_authenticated:
+            raise PermissionError("Client is not authenticated.")
+        began = asyncio.ensure_future(self._submit(CMD_BEGIN, b""))
+        try:
+            yield self
+        except BaseException:
+            with contextlib.suppress(Exception):
+                if (await began).ok:
+                    await self.rollback()
+            raise
+        response = await began
+        if not response.ok:
+            raise Exception(f"Begin failed: {response.status}: {response.message}")
+        response = await self.commit()
+        if not response.ok:
+            raise Exception(f"Commit failed: {response.status}: {response.message}")
 
     async def collection_create(self, name: str) -> CommandResponse:
         """Creates a new collection."""
-        return await self._send_command(CMD_COLLECTION_CREATE, write_string(name))
+        response = await self._send_command(CMD_COLLECTION_CREATE, write_string(name))
+        self._invalidate(_COLLECTIONS)
+        return response
 
     async def collection_delete(self, name: str) -> CommandResponse:
         """Deletes a collection."""
-        return await self._send_command(CMD_COLLECTION_DELETE, write_string(name))
+        response = await self._send_command(CMD_COLLECTION_DELETE, write_string(name))
+        self._invalidate(_COLLECTIONS, name, _indexes_of(name))
+        self._forget_writes(name)
+        return response
 
     async def collection_list(self) -> List[str]:
         """Lists all accessible collections."""
-        response = await self._send_command(CMD_COLLECTION_LIST, b"")
+        response = await self._send_read(CMD_COLLECTION_LIST, b"", (_COLLECTIONS,))
         if not response.ok:
             raise Exception(
                 f"Collection List failed: {response.status}: {response.message}"
@@ -302,19 +778,25 @@ class MemoryToolsClient:
     ) -> CommandResponse:
         """Creates an index on a collection field."""
         payload = write_string(collection_name) + write_string(field_name)
-        return await self._send_command(CMD_COLLECTION_INDEX_CREATE, payload)
+        response = await self._send_command(CMD_COLLECTION_INDEX_CREATE, payload)
+        self._invalidate(_indexes_of(collection_name))
+        return response
 
     async def collection_index_delete(
         self, collection_name: str, field_name: str
     ) -> CommandResponse:
         """Deletes an index from a collection."""
         payload = write_string(collection_name) + write_string(field_name)
-        return await self._send_command(CMD_COLLECTION_INDEX_DELETE, payload)
+        response = await self._send_command(CMD_COLLECTION_INDEX_DELETE, payload)
+        self._invalidate(_indexes_of(collection_name))
+        return response
 
     async def collection_index_list(self, collection_name: str) -> List[str]:
         """Lists all indexes on a collection."""
-        response = await self._send_command(
-            CMD_COLLECTION_INDEX_LIST, write_string(collection_name)
+        response = await self._send_read(
+            CMD_COLLECTION_INDEX_LIST,
+            write_string(collection_name),
+            (_indexes_of(collection_name),),
         )
         if not response.ok:
             raise Exception(f"Index List failed: {response.status}: {response.message}")
@@ -323,71 +805,108 @@ class MemoryToolsClient:
     async def collection_item_set(
         self,
         collection_name: str,
-        value: Dict,
+        value: Union[Dict, bytes],
         key: Optional[str] = None,
         ttl_seconds: int = 0,
     ) -> CommandResponse:
         """
         Sets an item in a collection.
         If a key is provided, it's used. If key is None, the server will generate a unique ID.
+        `value` may also be pre-encoded JSON bytes, which are sent as-is.
         Returns the full server response, access the created document with .json_data
         """
         final_key = key if key is not None else ""
-        
+        encoded = _encode_json(value)
+
         payload = (
             write_string(collection_name)
             + write_string(final_key)
-            + write_bytes(json.dumps(value).encode("utf-8"))
+            + write_bytes(encoded)
             + struct.pack("<q", ttl_seconds)
         )
-        return await self._send_command(CMD_COLLECTION_ITEM_SET, payload)
+        response = await self._send_command(CMD_COLLECTION_ITEM_SET, payload)
+        self._invalidate(collection_name)
+        if key is not None:
+            # Items that expire can't be served locally, since the server may already have dropped them.
+            known = encoded if response.ok and not ttl_seconds else None
+            self._remember_write(collection_name, key, known)
+        return response
 
     async def collection_item_set_many(
-        self, collection_name: str, items: List[Dict]
+        self, collection_name: str, items: Union[Iterable[Dict], bytes]
     ) -> CommandResponse:
         """
-        Sets multiple items in a collection. 
+        Sets multiple items in a collection.
         The server will assign a unique ID to any item missing an '_id'.
+        `items` may be any iterable of dicts (e.g. a generator), or a pre-encoded JSON array, which is sent as-is.
         Returns the full server response, access the created documents with .json_data
         """
 
-        payload = write_string(collection_name) + write_bytes(
-            json.dumps(items).encode("utf-8")
-        )
-        return await self._send_command(CMD_COLLECTION_ITEM_SET_MANY, payload)
+        if not isinstance(items, (list, tuple, bytes, bytearray, memoryview)):
+            # The batch is one length-prefixed frame, so it is encoded in full before sending.
+            items = list(items)
+        payload = write_string(collection_name) + write_bytes(_encode_json(items))
+        response = await self._send_command(CMD_COLLECTION_ITEM_SET_MANY, payload)
+        self._invalidate(collection_name)
+        self._forget_writes(collection_name)
+        return response
 
     async def collection_item_update(
-        self, collection_name: str, key: str, patch_value: Dict
+        self, collection_name: str, key: str, patch_value: Union[Dict, bytes]
     ) -> CommandResponse:
-        """Updates an item in a collection using a JSON patch."""
+        """Updates an item in a collection using a JSON patch (a dict or pre-encoded JSON bytes)."""
         payload = (
             write_string(collection_name)
             + write_string(key)
-            + write_bytes(json.dumps(patch_value).encode("utf-8"))
+            + write_bytes(_encode_json(patch_value))
+        )
+        response = await self._send_command(CMD_COLLECTION_ITEM_UPDATE, payload)
+        self._invalidate(collection_name)
+        known = (
+            self._recent_writes.get(collection_name, key)
+            if self._recent_writes is not None
+            else None
         )
-        return await self._send_command(CMD_COLLECTION_ITEM_UPDATE, payload)
+        if known is not None:
+            merged = _merge_patch(known, patch_value) if response.ok else None
+            self._remember_write(collection_name, key, merged)
+        return response
 
     async def collection_item_update_many(
-        self, collection_name: str, items: List[Dict]
+        self, collection_name: str, items: Union[List[Dict], bytes]
     ) -> CommandResponse:
-        """Updates multiple items in a collection. Expects a list of `_id` and `patch` objects."""
-        payload = write_string(collection_name) + write_bytes(
-            json.dumps(items).encode("utf-8")
-        )
-        return await self._send_command(CMD_COLLECTION_ITEM_UPDATE_MANY, payload)
+        """Updates multiple items in a collection. Expects a list of `_id` and `patch` objects, or its JSON bytes."""
+        payload = write_string(collection_name) + write_bytes(_encode_json(items))
+        response = await self._send_command(CMD_COLLECTION_ITEM_UPDATE_MANY, payload)
+        self._invalidate(collection_name)
+        self._forget_writes(collection_name)
+        return response
 
-    async def collection_item_get(self, collection_name: str, key: str) -> GetResult:
-        """Gets an item from a collection by its key."""
+    async def collection_item_get(
+        self, collection_name: str, key: str, allow_local: bool = False
+    ) -> GetResult:
+        """
+        Gets an item from a collection by its key.
+        With `allow_local`, on a client created with `remember_writes=True`, an item this client
+        set or updated (and hasn't written otherwise since) is returned as written, without a
+        round trip. It won't reflect other clients' writes, nor fields the server added itself.
+        """
+        if allow_local and self._recent_writes is not None:
+            known = self._recent_writes.get(collection_name, key)
+            if known is not None:
+                return GetResult(STATUS_OK, "Item served from a local write.", known)
         payload = write_string(collection_name) + write_string(key)
-        response = await self._send_command(CMD_COLLECTION_ITEM_GET, payload)
-        return GetResult(response.status_code, response.message, response.raw_data)
+        return await self._send_command(CMD_COLLECTION_ITEM_GET, payload, GetResult)
 
     async def collection_item_delete(
         self, collection_name: str, key: str
     ) -> CommandResponse:
         """Deletes an item from a collection by its key."""
         payload = write_string(collection_name) + write_string(key)
-        return await self._send_command(CMD_COLLECTION_ITEM_DELETE, payload)
+        response = await self._send_command(CMD_COLLECTION_ITEM_DELETE, payload)
+        self._invalidate(collection_name)
+        self._remember_write(collection_name, key, None)
+        return response
 
     async def collection_item_delete_many(
         self, collection_name: str, keys: List[str]
@@ -403,14 +922,183 @@ class MemoryToolsClient:
         for key in keys:
             payload_buffer.extend(write_string(key))
 
-        return await self._send_command(
+        response = await self._send_command(
             CMD_COLLECTION_ITEM_DELETE_MANY, bytes(payload_buffer)
         )
+        self._invalidate(collection_name)
+        if self._recent_writes is not None:
+            for key in keys:
+                self._recent_writes.forget(collection_name, key)
+        return response
 
-    async def collection_query(self, collection_name: str, query: Query) -> Any:
-        """Performs a complex query on a collection."""
-        payload = write_string(collection_name) + write_bytes(query.to_json())
-        response = await self._send_command(CMD_COLLECTION_QUERY, payload)
+    async def collection_query(
+        self, collection_name: str, query: Union[Query, bytes], use_cache: bool = True
+    ) -> Any:
+        """
+        Performs a complex query on a collection.
+        `query` may also be the bytes from `Query.to_json()`, so a query that is run
+        repeatedly is only serialized once.
+        Pass `use_cache=False` to always ask the server, e.g. when polling for a change.
+        """
+        encoded = query if isinstance(query, bytes) else query.to_json()
+        payload = write_string(collection_name) + write_bytes(encoded)
+        dependencies = (
+            _query_dependencies(collection_name, query)
+            if self._cache is not None
+            else ()
+        )
+        if use_cache:
+            response = await self._send_read(
+                CMD_COLLECTION_QUERY, payload, dependencies
+            )
+        else:
+            response = await self._send_command(CMD_COLLECTION_QUERY, payload)
         if not response.ok:
             raise Exception(f"Query failed: {response.status}: {response.message}")
-        return response.json_data
\ No newline at end of file
+        return response.json_data
+
+
+# --- Connection Pool ---
+class _PoolAcquireContext:
+    """Returned by `MemoryToolsPool.acquire()`; usable with `await` or `async with`."""
+
+    def __init__(self, pool: "MemoryToolsPool"):
+        self._pool = pool
+        self._client: Optional[MemoryToolsClient] = None
+
+    def __await__(self):
+        return self._pool._acquire().__await__()
+
+    async def __aenter__(self) -> MemoryToolsClient:
+        self._client = await self._pool._acquire()
+        return self._client
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        client, self._client = self._client, None
+        await self._pool.release(client)
+
+
+class MemoryToolsPool:
+    """
+    A pool of authenticated clients that share the connect and authentication cost.
+    Use `async with pool.acquire() as client:` to borrow a client for a unit of work,
+    or `client = await pool.acquire()` followed by `await pool.release(client)`.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        server_cert_path: Optional[str] = None,
+        reject_unauthorized: bool = True,
+        min_size: int = 1,
+        max_size: int = 10,
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(
+                "Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1."
+            )
+        self._client_args = (
+            host,
+            port,
+            username,
+            password,
+            server_cert_path,
+            reject_unauthorized,
+        )
+        self.min_size = min_size
+        self.max_size = max_size
+        self._idle: Deque[MemoryToolsClient] = deque()
+        self._size = 0
+        self._closed = False
+        # Notified whenever a client becomes idle, capacity is freed or the pool closes.
+        self._changed = asyncio.Condition()
+
+    @property
+    def size(self) -> int:
+        """Number of clients currently owned by the pool, idle or in use."""
+        return self._size
+
+    async def open(self):
+        """Connects and authenticates `min_size` clients concurrently."""
+        clients = [MemoryToolsClient(*self._client_args) for _ in range(self.min_size)]
+        self._size += len(clients)
+        # Every connect is awaited before cleaning up, so none is closed while still connecting.
+        results = await asyncio.gather(
+            *(client.connect() for client in clients), return_exceptions=True
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            await asyncio.gather(*(client.close() for client in clients))
+            async with self._changed:
+                self._size -= len(clients)
+                self._changed.notify_all()
+            raise errors[0]
+        async with self._changed:
+            self._idle.extend(clients)
+            self._changed.notify(len(clients))
+
+    def acquire(self) -> _PoolAcquireContext:
+        """Borrows a client from the pool, connecting a new one if none is idle and the pool is not full."""
+        return _PoolAcquireContext(self)
+
+    async def _acquire(self) -> MemoryToolsClient:
+        async with self._changed:
+            while True:
+                if self._closed:
+                    raise ConnectionError("Pool is closed.")
+                if self._idle:
+                    return self._idle.popleft()
+                if self._size < self.max_size:
+                    # Reserve the slot; the client connects outside the lock.
+                    self._size += 1
+                    break
+                await self._changed.wait()
+        client = MemoryToolsClient(*self._client_args)
+        try:
+            await client.connect()
+        except BaseException:
+            async with self._changed:
+                self._size -= 1
+                self._changed.notify()
+            raise
+        return client
+
+    async def release(self, client: MemoryToolsClient):
+        """
+        Returns a client to the pool. Clients whose connection was lost are discarded,
+        which frees their slot for a task waiting in `acquire()`.
+        """
+        async with self._changed:
+            discard = self._closed or not client.writer or client.writer.is_closing()
+            if discard:
+                self._size -= 1
+            else:
+                self._idle.append(client)
+            self._changed.notify()
+        if discard:
+            await client.close()
+
+    async def close(self):
+        """
+        Closes all idle clients and makes tasks waiting in `acquire()` raise ConnectionError.
+        Clients still in use are closed when released.
+        """
+        async with self._changed:
+            self._closed = True
+            clients = list(self._idle)
+            self._idle.clear()
+            self._size -= len(clients)
+            self._changed.notify_all()
+        await asyncio.gather(*(client.close() for client in clients))
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
@@ -1,7 +1,18 @@
+import argparse
 import asyncio
-import uuid
+import contextlib
+import contextvars
+import os
+import sys
+import time
 import json
-from src.memory_tools_client import MemoryToolsClient, Query, CommandResponse
+from typing import Awaitable, Callable
+from src.memory_tools_client import (
+    CommandResponse,
+    MemoryToolsClient,
+    MemoryToolsPool,
+    Query,
+)
 
 # --- Test Environment Configuration ---
 # Modify these variables if your server runs in another location or with different credentials
@@ -11,75 +22,319 @@ USERNAME = "admin"  # A user with write permissions on '*'
 PASSWORD = "adminpass"
 SERVER_CERT_PATH = None  # Path to the server's certificate
 REJECT_UNAUTHORIZED = False
+# Seconds the main client caches list and query reads, so the suites exercise the cache
+CACHE_TTL = 5.0
+# Timings are written as NDJSON records to METRICS_STREAM (stderr, or the --metrics file),
+# apart from the report; --human prints them in the report as text instead
+HUMAN_METRICS = False
+METRICS_STREAM = sys.stderr
+# Suites to run, by name (see SUITES); --suite narrows it to a subset
+SELECTED_SUITES: frozenset[str] = frozenset()
+# Response payloads larger than this are summarized instead of pretty-printed
+PRETTY_JSON_MAX_BYTES = 2048
+
+# --- Expected Results ---
+# After deleting item-1 and item-3 from item-0..item-4
+EXPECTED_BULK_KEYS = frozenset({"item-0", "item-2", "item-4"})
+
+# --- Query Test Data ---
+# Encoded once; the client sends pre-encoded JSON bytes as-is.
+USERS = (
+    {"_id": "u1", "name": "Elena", "age": 34, "active": True},
+    {"_id": "u2", "name": "Marcos", "age": 25, "active": True},
+    {"_id": "u3", "name": "Sofia", "age": 45, "active": False},
+)
+PROFILES = (
+    {"_id": "p1", "user_id": "u1", "city": "Madrid"},
+    {"_id": "p2", "user_id": "u2", "city": "Bogota"},
+)
+USERS_JSON = json.dumps(USERS).encode("utf-8")
+PROFILES_JSON = json.dumps(PROFILES).encode("utf-8")
+
+# --- Pre-encoded Queries ---
+# Queries that don't depend on per-run collection names are serialized once.
+QUERY_IDS = Query(projection=["_id"]).to_json()
+QUERY_ACTIVE_OVER_30 = Query(
+    filter={
+        "and": [
+            {"field": "active", "op": "=", "value": True},
+            {"field": "age", "op": ">", "value": 30},
+        ]
+    }
+).to_json()
+QUERY_NAME_AND_AGE = Query(projection=["name", "age"]).to_json()
+
+# --- JSON Output Codec ---
+# Encoders are built once and reused; orjson is used when the 'perf' extra is installed.
+try:
+    import orjson
+
+    def pretty_json(value) -> str:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode("utf-8")
+
+    def compact_json(value) -> str:
+        return orjson.dumps(value).decode("utf-8")
+
+    parse_json = orjson.loads
+except ImportError:
+    pretty_json = json.JSONEncoder(indent=2).encode
+    compact_json = json.JSONEncoder().encode
+    parse_json = json.loads
 
 # --- Helper Functions for Printing ---
+# Output is buffered while the tests run and written in a single call at the end,
+# so stdout writes don't interleave with (and stall) the awaited operations.
+# Suites that run concurrently each get their own buffer so their lines don't interleave.
+_output: list[str] = []
+_metrics: list[str] = []
+_suite_output: contextvars.ContextVar[list[str]] = contextvars.ContextVar(
+    "suite_output", default=_output
+)
+
+
+def emit(line: str = ""):
+    """Buffers a line of test output."""
+    _suite_output.get().append(line)
+
+
+def flush_output():
+    """Writes all buffered output to stdout, and the NDJSON metrics to METRICS_STREAM, at once."""
+    if _output:
+        sys.stdout.write("\n".join(_output) + "\n")
+        sys.stdout.flush()
+        _output.clear()
+    if _metrics:
+        METRICS_STREAM.write("\n".join(_metrics) + "\n")
+        METRICS_STREAM.flush()
+        _metrics.clear()
 
 
 def print_header(title: str):
     """Prints a header for a test section."""
-    print("\n" + "=" * 60)
-    print(f"--- {title.upper()} ---")
-    print("=" * 60)
+    emit("\n" + "=" * 60)
+    emit(f"--- {title.upper()} ---")
+    emit("=" * 60)
 
 
 def print_step(step: int, description: str):
     """Prints the current step of a test."""
-    print(f"\n{step}. {description}...")
+    emit(f"\n{step}. {description}...")
 
 
 def check_response(response: CommandResponse):
     """Checks a response and shows whether it was successful or not."""
     if response.ok:
-        print(f"   [SUCCESS]  Message: {response.message}")
-        if response.raw_data:
+        emit(f"   [SUCCESS]  Message: {response.message}")
+        if len(response.raw_data) >= PRETTY_JSON_MAX_BYTES:
+            emit(f"   [DATA]     <{len(response.raw_data)} bytes>")
+        elif response.raw_data:
             try:
                 # Pretty-print JSON if possible
-                parsed_json = json.loads(response.raw_data)
-                print(f"   [DATA]     {json.dumps(parsed_json, indent=2)}")
-            except json.JSONDecodeError:
-                print(f"   [DATA]     {response.raw_data.decode(errors='ignore')}")
+                parsed_json = parse_json(response.raw_data)
+                emit(f"   [DATA]     {pretty_json(parsed_json)}")
+            except json.JSONDecodeError:  # orjson.JSONDecodeError is a subclass
+                emit(f"   [DATA]     {response.raw_data.decode(errors='ignore')}")
+    else:
+        emit(f"   [FAILURE]  Status: {response.status}, Message: {response.message}")
+
+
+def metric(label: str, seconds: float):
+    """Records a timing, as an NDJSON line kept apart from the report or as report text with --human."""
+    if HUMAN_METRICS:
+        emit(f"\n{label}: {seconds:.3f}s")
     else:
-        print(f"   [FAILURE]  Status: {response.status}, Message: {response.message}")
+        _metrics.append(compact_json({"op": label, "s": round(seconds, 6)}))
+
+
+def print_query_ok(label: str, result: list):
+    """Summarizes a query result that was already decoded by the client."""
+    emit(f"   [SUCCESS]  {label}: {len(result)} row(s)")
+    if result:
+        emit(f"   [DATA]     First row fields: {', '.join(result[0])}")
+
+
+@contextlib.asynccontextmanager
+async def timed(label: str):
+    """Measures the wall time of the enclosed block and reports it as a metric."""
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        metric(label, (time.perf_counter_ns() - start) / 1e9)
+
+
+async def wait_until(
+    predicate: Callable[[], Awaitable[bool]],
+    timeout: float = 1.0,
+    interval: float = 0.005,
+) -> bool:
+    """Polls `predicate` until it returns True or `timeout` seconds pass. Returns the last outcome."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not await predicate():
+        if loop.time() >= deadline:
+            return False
+        await asyncio.sleep(interval)
+    return True
 
 
 async def main():
     """Main function that orchestrates all tests."""
+    # The failed-authentication probe uses its own throwaway client, so it runs
+    # concurrently with the main suite instead of adding its handshake in front of it.
+    # The main suite buffers its output separately so the report still opens with
+    # the authentication result.
+    main_output: list[str] = []
+    main_context = contextvars.copy_context()
+    main_context.run(_suite_output.set, main_output)
+    auth_probe = None
+    try:
+        async with asyncio.TaskGroup() as tg:
+            auth_probe = tg.create_task(run_auth_failure_test())
+            tg.create_task(run_main_suite(), context=main_context)
+    finally:
+        # Runs even if the tests are cancelled or interrupted, so the progress made so far is reported.
+        auth_known = (
+            auth_probe is not None
+            and auth_probe.done()
+            and not auth_probe.cancelled()
+            and auth_probe.exception() is None
+        )
+        if auth_known:
+            print_header("Authentication Tests")
+            print_step(1, "Connecting with invalid credentials")
+            if auth_probe.result():
+                emit("   [SUCCESS]  The server rejected the invalid credentials.")
+            else:
+                emit("   [FAILURE]  The server did not reject the invalid credentials.")
+        _output.extend(main_output)
+        flush_output()
+
+
+async def run_auth_failure_test() -> bool:
+    """Returns True if the server rejects a client with invalid credentials."""
     client = MemoryToolsClient(
-        HOST, PORT, USERNAME, PASSWORD, SERVER_CERT_PATH, REJECT_UNAUTHORIZED
+        HOST,
+        PORT,
+        "nonexistent_user",
+        "wrongpassword",
+        SERVER_CERT_PATH,
+        REJECT_UNAUTHORIZED,
     )
-
     try:
         await client.connect()
-        if not client.is_authenticated:
-            print("[FAILURE] Initial client authentication failed. Aborting tests.")
-            return
-
-        # --- Collections and Indexes Test ---
-        await run_collection_and_index_tests(client)
+    except PermissionError:
+        return True
+    except Exception:
+        return False  # Not an authentication failure (e.g. the server is unreachable)
+    finally:
+        await client.close()
+    return False
+
+
+async def run_main_suite():
+    """
+    Runs every test suite on one authenticated client.
+    The client is created once and passed to each suite; suites must not open their
+    own, so adding a suite doesn't add a TLS handshake and authentication round trip.
+    """
+    if not (USERNAME and PASSWORD):
+        emit(
+            "[FAILURE] The tests need USERNAME and PASSWORD to authenticate. Aborting tests."
+        )
+        return
 
-        # --- CRUD Operations Test ---
-        await run_crud_tests(client)
+    client = MemoryToolsClient(
+        HOST,
+        PORT,
+        USERNAME,
+        PASSWORD,
+        SERVER_CERT_PATH,
+        REJECT_UNAUTHORIZED,
+        cache_ttl=CACHE_TTL,
+        remember_writes=True,
+    )
 
-        # --- Bulk Operations Test ---
-        await run_bulk_tests(client)
+    try:
+        # --- Collections/Indexes, CRUD, Bulk and Queries Tests ---
+        # Each of these suites works on its own uniquely named collection, so they run
+        # concurrently. Connecting raises if authentication fails; the suites' first
+        # commands are pipelined behind the authentication frame.
+        if not await client.connect_and(run_independent_suites):
+            emit("\nStopping after the first failed suite.")
+            return
 
         # --- Transactions Test ---
-        await run_transaction_tests(client)
+        # Transaction state is per connection, so this suite runs on its own.
+        if "tx" in SELECTED_SUITES:
+            async with timed("Transactions"):
+                await run_transaction_tests(client)
 
-        # --- Complex Queries Test ---
-        await run_query_tests(client)
+        # --- Connection Pool Test ---
+        # The pool opens connections of its own; the shared client only manages the collection.
+        if "pool" in SELECTED_SUITES:
+            async with timed("Connection_Pool"):
+                await run_pool_tests(client)
 
     except Exception as e:
-        print(f"\n\nAn unexpected error occurred during tests: {e}")
+        emit(f"\n\nAn unexpected error occurred during tests: {e}")
     finally:
         if client.writer and not client.writer.is_closing():
             await client.close()
-            print("\nConnection closed.")
+            emit("\nConnection closed.")
+
+
+async def run_independent_suites(client: MemoryToolsClient) -> bool:
+    """
+    Runs the suites that share no data concurrently, reporting their output in order.
+    The first suite to fail cancels the others, whose cleanup still runs. Returns True if all passed.
+    """
+    suites = [
+        (label, suite)
+        for name, (label, suite) in SUITES.items()
+        if name in SELECTED_SUITES and name not in SEQUENTIAL_SUITES
+    ]
+    buffers = [[] for _ in suites]
+    tasks = []
+    try:
+        async with asyncio.TaskGroup() as tg:
+            for (label, suite), lines in zip(suites, buffers):
+                tasks.append(tg.create_task(run_suite(label, suite, client, lines)))
+    except* Exception:
+        pass  # Each failure is reported below, next to its suite's output
+    finally:
+        # Also merged when the run is cancelled, so the suites' partial output isn't lost.
+        for (label, _), lines, task in zip(suites, buffers, tasks):
+            _suite_output.get().extend(lines)
+            if not task.done():
+                continue
+            if task.cancelled():
+                emit(
+                    f"\n   [SKIPPED]  Suite '{label}' was cancelled before it finished."
+                )
+            elif task.exception() is not None:
+                emit(
+                    f"\n   [FAILURE]  Suite '{label}' raised an error: {task.exception()}"
+                )
+    return all(not task.cancelled() and task.exception() is None for task in tasks)
+
+
+async def run_suite(
+    label: str,
+    suite: Callable[[MemoryToolsClient], Awaitable[None]],
+    client: MemoryToolsClient,
+    lines: list[str],
+):
+    """Runs one timed suite, buffering its output in `lines`."""
+    # Each suite runs in its own task and context, so this doesn't leak.
+    _suite_output.set(lines)
+    async with timed(label):
+        await suite(client)
 
 
 async def run_collection_and_index_tests(client: MemoryToolsClient):
     print_header("Collection and Index Management Tests")
-    coll_name = f"test_coll_{uuid.uuid4().hex[:8]}"
+    coll_name = f"test_coll_{os.urandom(4).hex()}"
 
     try:
         print_step(1, f"Creating collection '{coll_name}'")
@@ -88,38 +343,54 @@ async def run_collection_and_index_tests(client: MemoryToolsClient):
         print_step(2, "Listing collections to verify creation")
         collections = await client.collection_list()
         if coll_name in collections:
-            print(f"   [SUCCESS]  Collection '{coll_name}' was found in the list.")
+            emit(f"   [SUCCESS]  Collection '{coll_name}' was found in the list.")
+        else:
+            emit(f"   [FAILURE]  Collection '{coll_name}' was NOT found.")
+
+        print_step(3, "Listing indexes twice to verify the second read is cached")
+        stats_before = client.cache_stats()
+        await client.collection_index_list(coll_name)
+        stats_between = client.cache_stats()
+        await client.collection_index_list(coll_name)
+        stats_after = client.cache_stats()
+        if (
+            stats_between["misses"] > stats_before["misses"]
+            and stats_after["hits"] > stats_between["hits"]
+        ):
+            emit("   [SUCCESS]  The first read missed the cache and the second hit it.")
         else:
-            print(f"   [FAILURE]  Collection '{coll_name}' was NOT found.")
+            emit(f"   [FAILURE]  Unexpected cache counters: {stats_after}")
 
-        print_step(3, "Creating an index on the 'city' field")
+        print_step(4, "Creating an index on the 'city' field")
         check_response(await client.collection_index_create(coll_name, "city"))
 
-        print_step(4, "Listing indexes to verify creation")
+        print_step(
+            5, "Listing indexes to verify creation (the cached list is invalidated)"
+        )
         indexes = await client.collection_index_list(coll_name)
         if "city" in indexes:
-            print("   [SUCCESS]  The 'city' index was found.")
+            emit("   [SUCCESS]  The 'city' index was found.")
         else:
-            print("   [FAILURE]  The 'city' index was NOT found.")
+            emit("   [FAILURE]  The 'city' index was NOT found.")
 
-        print_step(5, "Deleting the 'city' index")
+        print_step(6, "Deleting the 'city' index")
         check_response(await client.collection_index_delete(coll_name, "city"))
 
-        print_step(6, "Listing indexes to verify deletion")
+        print_step(7, "Listing indexes to verify deletion")
         indexes_after_delete = await client.collection_index_list(coll_name)
         if "city" not in indexes_after_delete:
-            print("   [SUCCESS]  The 'city' index no longer exists.")
+            emit("   [SUCCESS]  The 'city' index no longer exists.")
         else:
-            print("   [FAILURE]  The 'city' index still exists.")
+            emit("   [FAILURE]  The 'city' index still exists.")
 
     finally:
-        print_step(7, f"Cleanup: deleting collection '{coll_name}'")
+        print_step(8, f"Cleanup: deleting collection '{coll_name}'")
         check_response(await client.collection_delete(coll_name))
 
 
 async def run_crud_tests(client: MemoryToolsClient):
     print_header("CRUD Operations Tests (Create, Read, Update, Delete)")
-    coll_name = f"crud_coll_{uuid.uuid4().hex[:8]}"
+    coll_name = f"crud_coll_{os.urandom(4).hex()}"
     item_key = "user-001"
 
     try:
@@ -146,7 +417,10 @@ async def run_crud_tests(client: MemoryToolsClient):
         )
 
         print_step(4, "GET (Read) to verify the update")
-        get_updated_resp = await client.collection_item_get(coll_name, item_key)
+        # Step 2 already read the item from the server; this check trusts the acknowledged update.
+        get_updated_resp = await client.collection_item_get(
+            coll_name, item_key, allow_local=True
+        )
         check_response(get_updated_resp)
         if get_updated_resp.found:
             assert get_updated_resp.value["age"] == 41
@@ -157,9 +431,9 @@ async def run_crud_tests(client: MemoryToolsClient):
         print_step(6, "GET (Read) to verify the deletion")
         get_deleted_resp = await client.collection_item_get(coll_name, item_key)
         if not get_deleted_resp.found:
-            print(f"   [SUCCESS]  Item '{item_key}' was not found, as expected.")
+            emit(f"   [SUCCESS]  Item '{item_key}' was not found, as expected.")
         else:
-            print(f"   [FAILURE]  Item '{item_key}' still exists.")
+            emit(f"   [FAILURE]  Item '{item_key}' still exists.")
 
     finally:
         await client.collection_delete(coll_name)
@@ -167,12 +441,12 @@ async def run_crud_tests(client: MemoryToolsClient):
 
 async def run_bulk_tests(client: MemoryToolsClient):
     print_header("Bulk Operations Tests (set_many, delete_many)")
-    coll_name = f"bulk_coll_{uuid.uuid4().hex[:8]}"
+    coll_name = f"bulk_coll_{os.urandom(4).hex()}"
 
     try:
         await client.collection_create(coll_name)
 
-        items_to_set = [{"_id": f"item-{i}", "val": i * 10} for i in range(5)]
+        items_to_set = ({"_id": f"item-{i}", "val": i * 10} for i in range(5))
         keys_to_delete = ["item-1", "item-3"]
 
         print_step(1, "SET MANY: Inserting 5 items")
@@ -183,23 +457,25 @@ async def run_bulk_tests(client: MemoryToolsClient):
             await client.collection_item_delete_many(coll_name, keys_to_delete)
         )
 
-        # --- SOLUTION: Add a small pause here ---
-        # This gives the server time to stabilize its in-memory state before the query.
-        await asyncio.sleep(0.1)
+        # Wait until the server reports the post-delete state instead of sleeping a fixed time.
+        # The last poll's ids are kept, so verifying them doesn't cost another query.
+        final_keys: set[str] = set()
 
-        print_step(3, "Verifying the final state")
-        final_items = await client.collection_query(coll_name, Query())
-        final_keys = {item["_id"] for item in final_items}
+        async def deletes_applied() -> bool:
+            nonlocal final_keys
+            items = await client.collection_query(coll_name, QUERY_IDS, use_cache=False)
+            final_keys = {item["_id"] for item in items}
+            return final_keys == EXPECTED_BULK_KEYS
 
-        # The correct verification: item-0, item-2, and item-4 should remain
-        expected_keys = {"item-0", "item-2", "item-4"}
+        await wait_until(deletes_applied)
 
-        if final_keys == expected_keys:
-            print("   [SUCCESS]  The collection's state is as expected.")
+        print_step(3, "Verifying the final state")
+        if final_keys == EXPECTED_BULK_KEYS:
+            emit("   [SUCCESS]  The collection's state is as expected.")
         else:
-            print(f"   [FAILURE]  The final state is not correct.")
-            print(f"            - Expected: {expected_keys}")
-            print(f"            - Found: {final_keys}")
+            emit(f"   [FAILURE]  The final state is not correct.")
+            emit(f"            - Expected: {set(EXPECTED_BULK_KEYS)}")
+            emit(f"            - Found: {final_keys}")
 
     finally:
         await client.collection_delete(coll_name)
@@ -207,7 +483,7 @@ async def run_bulk_tests(client: MemoryToolsClient):
 
 async def run_transaction_tests(client: MemoryToolsClient):
     print_header("Transaction Tests (Commit and Rollback)")
-    coll_name = f"tx_coll_{uuid.uuid4().hex[:8]}"
+    coll_name = f"tx_coll_{os.urandom(4).hex()}"
     key_commit = "committed-key"
     key_rollback = "rolled-back-key"
 
@@ -216,18 +492,18 @@ async def run_transaction_tests(client: MemoryToolsClient):
 
         # --- COMMIT Test ---
         print_step(1, "Testing a successful COMMIT")
-        await client.begin()
-        await client.collection_item_set(
-            coll_name, {"tx_status": "final"}, key=key_commit
-        )
-        await client.commit()
+        # BEGIN is written together with the SET, saving a round trip.
+        async with client.transaction():
+            await client.collection_item_set(
+                coll_name, {"tx_status": "final"}, key=key_commit
+            )
         get_committed = await client.collection_item_get(coll_name, key_commit)
         if get_committed.found:
-            print(
+            emit(
                 "   [SUCCESS]  The item written in the transaction was found after commit."
             )
         else:
-            print("   [FAILURE]  The item was not found after commit.")
+            emit("   [FAILURE]  The item was not found after commit.")
 
         # --- ROLLBACK Test ---
         print_step(2, "Testing a ROLLBACK")
@@ -238,62 +514,119 @@ async def run_transaction_tests(client: MemoryToolsClient):
         await client.rollback()
         get_rolled_back = await client.collection_item_get(coll_name, key_rollback)
         if not get_rolled_back.found:
-            print(
+            emit(
                 "   [SUCCESS]  The item written in the transaction was not found after rollback, as expected."
             )
         else:
-            print("   [FAILURE]  An item that should have been rolled back was found.")
+            emit("   [FAILURE]  An item that should have been rolled back was found.")
 
     finally:
         await client.collection_delete(coll_name)
 
 
-async def run_query_tests(client: MemoryToolsClient):
-    print_header("Query Tests (Filter, Projection, Lookup)")
-    users_coll = f"users_{uuid.uuid4().hex[:8]}"
-    profiles_coll = f"profiles_{uuid.uuid4().hex[:8]}"
+async def run_pool_tests(client: MemoryToolsClient):
+    print_header("Connection Pool Tests (Acquire, Release, Reuse)")
+    coll_name = f"pool_coll_{os.urandom(4).hex()}"
+    item_key = "pooled-key"
 
     try:
-        await client.collection_create(users_coll)
-        await client.collection_create(profiles_coll)
+        await client.collection_create(coll_name)
 
-        users = [
-            {"_id": "u1", "name": "Elena", "age": 34, "active": True},
-            {"_id": "u2", "name": "Marcos", "age": 25, "active": True},
-            {"_id": "u3", "name": "Sofia", "age": 45, "active": False},
-        ]
-        profiles = [
-            {"_id": "p1", "user_id": "u1", "city": "Madrid"},
-            {"_id": "p2", "user_id": "u2", "city": "Bogota"},
-        ]
-        await client.collection_item_set_many(users_coll, users)
-        await client.collection_item_set_many(profiles_coll, profiles)
-        await asyncio.sleep(0.1)  # Give the server time to process writes
+        async with MemoryToolsPool(
+            HOST,
+            PORT,
+            USERNAME,
+            PASSWORD,
+            SERVER_CERT_PATH,
+            REJECT_UNAUTHORIZED,
+            min_size=1,
+            max_size=1,
+        ) as pool:
+            print_step(1, "ACQUIRE a client and write an item")
+            held = await pool.acquire()
+            check_response(
+                await held.collection_item_set(coll_name, {"via": "pool"}, key=item_key)
+            )
 
-        print_step(1, "Query with Filter: active users with age > 30")
-        q_filter = Query(
-            filter={
-                "and": [
-                    {"field": "active", "op": "=", "value": True},
-                    {"field": "age", "op": ">", "value": 30},
-                ]
-            }
-        )
-        result = await client.collection_query(users_coll, q_filter)
-        check_response(
-            CommandResponse(1, "Query executed", json.dumps(result).encode())
-        )
-        assert len(result) == 1 and result[0]["name"] == "Elena"
+            print_step(2, "ACQUIRE from a second task while the only client is in use")
+            waiter = asyncio.ensure_future(pool.acquire())
+            await asyncio.sleep(0)
+            if not waiter.done():
+                emit("   [SUCCESS]  The second task waits, as the pool is full.")
+            else:
+                emit("   [FAILURE]  The second task got a client from a full pool.")
+
+            print_step(3, "RELEASE the client and verify the waiting task reuses it")
+            await pool.release(held)
+            reused = await asyncio.wait_for(waiter, timeout=5)
+            get_resp = await reused.collection_item_get(coll_name, item_key)
+            if reused is held and get_resp.found and pool.size == 1:
+                emit(
+                    "   [SUCCESS]  The released client was handed to the waiting task."
+                )
+            else:
+                emit(
+                    "   [FAILURE]  The waiting task did not reuse the released client."
+                )
+
+            print_step(
+                4, "RELEASE a dropped client and verify the waiting task gets a new one"
+            )
+            waiter = asyncio.ensure_future(pool.acquire())
+            await reused.close()  # Simulates a lost connection
+            await pool.release(reused)
+            replacement = await asyncio.wait_for(waiter, timeout=5)
+            if (
+                replacement is not reused
+                and replacement.is_authenticated
+                and pool.size == 1
+            ):
+                emit("   [SUCCESS]  The waiting task got a newly connected client.")
+            else:
+                emit("   [FAILURE]  The waiting task did not get a working client.")
+            await pool.release(replacement)
 
-        print_step(2, "Query with Projection: get only name and age")
-        q_proj = Query(projection=["name", "age"])
-        result = await client.collection_query(users_coll, q_proj)
-        check_response(
-            CommandResponse(1, "Query executed", json.dumps(result).encode())
+    finally:
+        await client.collection_delete(coll_name)
+
+
+async def run_query_tests(client: MemoryToolsClient):
+    print_header("Query Tests (Filter, Projection, Lookup)")
+    users_coll = f"users_{os.urandom(4).hex()}"
+    profiles_coll = f"profiles_{os.urandom(4).hex()}"
+
+    try:
+        # The two collections are independent, so their setup is pipelined.
+        await asyncio.gather(
+            client.collection_create(users_coll),
+            client.collection_create(profiles_coll),
+        )
+        await asyncio.gather(
+            client.collection_item_set_many(users_coll, USERS_JSON),
+            client.collection_item_set_many(profiles_coll, PROFILES_JSON),
         )
-        assert all("active" not in user for user in result)
+        # Wait until all writes are visible instead of sleeping a fixed time.
+        # The last poll's counts are kept to report which collection fell short.
+        expected_counts = {users_coll: len(USERS), profiles_coll: len(PROFILES)}
+        counts: dict[str, int] = {}
+
+        async def writes_applied() -> bool:
+            users, profiles = await asyncio.gather(
+                client.collection_query(users_coll, QUERY_IDS, use_cache=False),
+                client.collection_query(profiles_coll, QUERY_IDS, use_cache=False),
+            )
+            counts.update({users_coll: len(users), profiles_coll: len(profiles)})
+            return counts == expected_counts
+
+        if not await wait_until(writes_applied):
+            emit("   [FAILURE]  The setup writes never became visible:")
+            for coll, expected in expected_counts.items():
+                if counts.get(coll) != expected:
+                    emit(
+                        f"            - {coll}: expected {expected}, found {counts.get(coll)}"
+                    )
+            return
 
-        print_step(3, "Query with Lookup (JOIN): join profiles with users")
         q_lookup = Query(
             lookups=[
                 {
@@ -304,19 +637,83 @@ async def run_query_tests(client: MemoryToolsClient):
                 }
             ]
         )
-        result = await client.collection_query(profiles_coll, q_lookup)
-        check_response(
-            CommandResponse(1, "Query executed", json.dumps(result).encode())
+        # The three queries are independent reads, so they are pipelined together.
+        filter_result, proj_result, lookup_result = await asyncio.gather(
+            client.collection_query(users_coll, QUERY_ACTIVE_OVER_30),
+            client.collection_query(users_coll, QUERY_NAME_AND_AGE),
+            client.collection_query(profiles_coll, q_lookup),
         )
-        profile1 = next(p for p in result if p["_id"] == "p1")
+
+        print_step(1, "Query with Filter: active users with age > 30")
+        print_query_ok("Filter query", filter_result)
+        assert len(filter_result) == 1 and filter_result[0]["name"] == "Elena"
+
+        print_step(2, "Query with Projection: get only name and age")
+        print_query_ok("Projection query", proj_result)
+        assert all("active" not in user for user in proj_result)
+
+        print_step(3, "Query with Lookup (JOIN): join profiles with users")
+        print_query_ok("Lookup query", lookup_result)
+        profile1 = next(p for p in lookup_result if p["_id"] == "p1")
         assert profile1["user_info"]["name"] == "Elena"
 
     finally:
-        await client.collection_delete(users_coll)
-        await client.collection_delete(profiles_coll)
+        # Independent deletes; a failure in one must not skip the other.
+        await asyncio.gather(
+            client.collection_delete(users_coll),
+            client.collection_delete(profiles_coll),
+            return_exceptions=True,
+        )
+
+
+# Suites by the name --suite selects them with, in report order.
+# The sequential ones run after the others: transaction state is per connection,
+# and the pool test counts connections.
+SEQUENTIAL_SUITES = frozenset({"tx", "pool"})
+SUITES = {
+    "collections": ("Collections_And_Indexes", run_collection_and_index_tests),
+    "crud": ("CRUD", run_crud_tests),
+    "bulk": ("Bulk", run_bulk_tests),
+    "query": ("Queries", run_query_tests),
+    "tx": ("Transactions", run_transaction_tests),
+    "pool": ("Connection_Pool", run_pool_tests),
+}
 
 
 if __name__ == "__main__":
-    print("Starting test suite for MemoryToolsClient...")
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="MemoryToolsClient test suite")
+    parser.add_argument(
+        "--human", action="store_true", help="print timings as text instead of NDJSON"
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="PATH",
+        help="write the NDJSON timings to this file instead of stderr",
+    )
+    parser.add_argument(
+        "--suite",
+        action="append",
+        choices=SUITES,
+        help="run only this suite (repeatable); all suites run by default",
+    )
+    args = parser.parse_args()
+    HUMAN_METRICS = args.human
+    if args.metrics:
+        METRICS_STREAM = open(args.metrics, "w", encoding="utf-8")
+    SELECTED_SUITES = frozenset(args.suite or SUITES)
+
+    try:
+        import uvloop
+
+        loop_factory = uvloop.new_event_loop
+    except ImportError:  # uvloop is optional and unavailable on Windows
+        loop_factory = None
+
+    loop_name = "uvloop" if loop_factory else "asyncio"
+    print(f"Starting test suite for MemoryToolsClient ({loop_name} event loop)...")
+    try:
+        asyncio.run(main(), loop_factory=loop_factory)
+    finally:
+        if METRICS_STREAM is not sys.stderr:
+            METRICS_STREAM.close()
     print("\nTest suite finished.")